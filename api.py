@@ -1,14 +1,11 @@
-import io
-import json
-import tempfile
-from pathlib import Path
-from typing import List, Optional
+from typing import List
 
 import uvicorn
 from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 
-from claim_pipeline import process_claims
+from claim_pipeline import process_claims_stream
 
 
 app = FastAPI(
@@ -30,33 +27,8 @@ async def upload_alpha_csv(file: UploadFile = File(...)):
         raise HTTPException(status_code=400, detail="File must be a CSV")
     
     try:
-        content = await file.read()
-        # Create temporary file for processing
-        with tempfile.NamedTemporaryFile(mode='wb', suffix='.csv', delete=False) as tmp:
-            tmp.write(content)
-            tmp_path = Path(tmp.name)
-        
-        # Process with pipeline
-        output_path = Path("temp_candidates.json")
-        metrics_path = Path("temp_metrics.json")
-        
-        process_claims(
-            alpha_path=tmp_path,
-            beta_path=Path("/dev/null"),  # No beta data for alpha-only uploads
-            out_path=output_path,
-            metrics_out_path=metrics_path,
-            rejections_log_path=None,
-        )
-        
-        # Read results
-        with open(output_path, 'r') as f:
-            candidates = json.load(f)
-        
-        # Cleanup temp files
-        tmp_path.unlink()
-        output_path.unlink()
-        metrics_path.unlink()
-        
+        # Read straight from the spooled upload; no beta data for alpha-only uploads
+        candidates, _ = await run_in_threadpool(process_claims_stream, file.file, None)
         return candidates
         
     except Exception as e:
@@ -70,33 +42,8 @@ async def upload_beta_json(file: UploadFile = File(...)):
         raise HTTPException(status_code=400, detail="File must be a JSON")
     
     try:
-        content = await file.read()
-        # Create temporary file for processing
-        with tempfile.NamedTemporaryFile(mode='wb', suffix='.json', delete=False) as tmp:
-            tmp.write(content)
-            tmp_path = Path(tmp.name)
-        
-        # Process with pipeline
-        output_path = Path("temp_candidates.json")
-        metrics_path = Path("temp_metrics.json")
-        
-        process_claims(
-            alpha_path=Path("/dev/null"),  # No alpha data for beta-only uploads
-            beta_path=tmp_path,
-            out_path=output_path,
-            metrics_path=metrics_path,
-            rejections_log_path=None,
-        )
-        
-        # Read results
-        with open(output_path, 'r') as f:
-            candidates = json.load(f)
-        
-        # Cleanup temp files
-        tmp_path.unlink()
-        output_path.unlink()
-        metrics_path.unlink()
-        
+        # Read straight from the spooled upload; no alpha data for beta-only uploads
+        candidates, _ = await run_in_threadpool(process_claims_stream, None, file.file)
         return candidates
         
     except Exception as e:
@@ -115,40 +62,8 @@ async def upload_both_files(
         raise HTTPException(status_code=400, detail="Beta file must be a JSON")
     
     try:
-        alpha_content = await alpha_file.read()
-        beta_content = await beta_file.read()
-        
-        # Create temporary files for processing
-        with tempfile.NamedTemporaryFile(mode='wb', suffix='.csv', delete=False) as alpha_tmp:
-            alpha_tmp.write(alpha_content)
-            alpha_path = Path(alpha_tmp.name)
-        
-        with tempfile.NamedTemporaryFile(mode='wb', suffix='.json', delete=False) as beta_tmp:
-            beta_tmp.write(beta_content)
-            beta_path = Path(beta_tmp.name)
-        
-        # Process with pipeline
-        output_path = Path("temp_candidates.json")
-        metrics_path = Path("temp_metrics.json")
-        
-        process_claims(
-            alpha_path=alpha_path,
-            beta_path=beta_path,
-            out_path=output_path,
-            metrics_path=metrics_path,
-            rejections_log_path=None,
-        )
-        
-        # Read results
-        with open(output_path, 'r') as f:
-            candidates = json.load(f)
-        
-        # Cleanup temp files
-        alpha_path.unlink()
-        beta_path.unlink()
-        output_path.unlink()
-        metrics_path.unlink()
-        
+        # Read straight from the spooled uploads
+        candidates, _ = await run_in_threadpool(process_claims_stream, alpha_file.file, beta_file.file)
         return candidates
         
     except Exception as e:
@@ -1,14 +1,30 @@
 import argparse
 import csv
-import json
+import io
+import itertools
 import logging
-from dataclasses import dataclass, field
-from datetime import date, datetime
+import os
+import re
+import shutil
+import sys
+import tempfile
+from calendar import monthrange
+from collections import Counter
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import BinaryIO, Callable, Dict, Iterable, List, Optional, Tuple
+
+import ijson
+import orjson
 
 
 REFERENCE_TODAY = date(2025, 7, 30)
+# Claims submitted on or after this date are within 7 days of REFERENCE_TODAY
+SUBMISSION_CUTOFF = REFERENCE_TODAY - timedelta(days=7)
 
 
 def configure_logging() -> None:
@@ -18,111 +34,157 @@ def configure_logging() -> None:
     )
 
 
-def to_iso_date_string(raw: str) -> Optional[str]:
-    if raw is None:
-        return None
-    raw_stripped = str(raw).strip()
-    if raw_stripped == "":
+_ISO_DATE_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2})(?:[T ](?:[01]\d|2[0-3]):[0-5]\d:[0-5]\d)?")
+
+
+@lru_cache(maxsize=1 << 16)
+def _parse_iso_date(raw_stripped: str) -> Optional[date]:
+    # Submission dates repeat heavily across claims, so parse each distinct string once
+    match = _ISO_DATE_RE.fullmatch(raw_stripped)
+    if match is not None:
+        # Fast path for YYYY-MM-DD, optionally with a plain HH:MM:SS time, validated without exceptions
+        year, month, day = int(match[1]), int(match[2]), int(match[3])
+        if year >= 1 and 1 <= month <= 12 and 1 <= day <= monthrange(year, month)[1]:
+            return date(year, month, day)
         return None
     try:
-        # Attempt full ISO datetime first
-        dt = datetime.fromisoformat(raw_stripped)
-        return dt.date().isoformat()
-    except Exception:
+        # Full ISO datetime
+        return datetime.fromisoformat(raw_stripped).date()
+    except ValueError:
         pass
     try:
-        # Fallback to simple date
-        dt = datetime.strptime(raw_stripped, "%Y-%m-%d")
-        return dt.date().isoformat()
-    except Exception:
+        # Fallback to lenient simple date (e.g. unpadded month/day)
+        return datetime.strptime(raw_stripped, "%Y-%m-%d").date()
+    except ValueError:
         return None
 
 
+def to_date(raw: Optional[object]) -> Optional[date]:
+    if raw is None:
+        return None
+    raw_stripped = str(raw).strip()
+    if raw_stripped == "":
+        return None
+    return _parse_iso_date(raw_stripped)
+
+
+# One shared object per source label, reused by every claim and the metrics keys
+SOURCE_ALPHA = sys.intern("alpha")
+SOURCE_BETA = sys.intern("beta")
+
+_APPROVED = sys.intern("approved")
+_DENIED = sys.intern("denied")
+# Spellings seen in practice map straight to the interned status without lowercasing
+_STATUS_EXACT: Dict[str, str] = {
+    "approved": _APPROVED,
+    "Approved": _APPROVED,
+    "APPROVED": _APPROVED,
+    "denied": _DENIED,
+    "Denied": _DENIED,
+    "DENIED": _DENIED,
+}
+_NULL_TOKENS = frozenset({"none", "null", "nan"})
+_NULL_TOKEN_MAX_LEN = max(len(token) for token in _NULL_TOKENS)
+
+
 def normalize_status(raw: Optional[str]) -> Optional[str]:
     if raw is None:
         return None
-    value = str(raw).strip().lower()
-    if value in {"approved", "denied"}:
-        return value
-    return None
+    value = str(raw).strip()
+    status = _STATUS_EXACT.get(value)
+    if status is not None:
+        return status
+    # Fallback for unusual casing, e.g. "dEnIeD"
+    return _STATUS_EXACT.get(value.lower())
 
 
 def normalize_string_or_none(raw: Optional[str]) -> Optional[str]:
     if raw is None:
         return None
     value = str(raw).strip()
-    if value.lower() in {"", "none", "null", "nan"}:
+    if value == "":
+        return None
+    # Only short values can be null tokens; skip lowercasing everything else
+    if len(value) <= _NULL_TOKEN_MAX_LEN and value.lower() in _NULL_TOKENS:
         return None
     return value
 
 
-def days_between(submitted_at_iso_date: Optional[str], reference: date) -> Optional[int]:
-    if submitted_at_iso_date is None:
-        return None
-    try:
-        d = datetime.strptime(submitted_at_iso_date, "%Y-%m-%d").date()
-        return (reference - d).days
-    except Exception:
-        return None
+@lru_cache(maxsize=1024)
+def _canonicalize_denial_reason_str(raw: str) -> Optional[str]:
+    # normalize_string_or_none already strips surrounding whitespace
+    return normalize_string_or_none(raw)
 
 
 def canonicalize_denial_reason(raw: Optional[str]) -> Optional[str]:
-    value = normalize_string_or_none(raw)
-    if value is None:
-        return None
-    return value.strip()
+    # Denial reasons are a small, heavily repeated set, so memoize the common string case
+    if isinstance(raw, str):
+        return _canonicalize_denial_reason_str(raw)
+    return normalize_string_or_none(raw)
+
+
+# Canonical mappings (case-insensitive comparisons)
+RETRYABLE_REASONS: Dict[str, str] = {
+    "missing modifier": "Missing modifier",
+    "incorrect npi": "Incorrect NPI",
+    "prior auth required": "Prior auth required",
+}
+NON_RETRYABLE_REASONS: Dict[str, str] = {
+    "authorization expired": "Authorization expired",
+    "incorrect provider type": "Incorrect provider type",
+}
+AMBIGUOUS_REASONS: Dict[str, Tuple[bool, str]] = {
+    # Heuristics for ambiguous reasons
+    # format: lowercased_input -> (is_retryable, canonical_reason)
+    "incorrect procedure": (False, "Incorrect procedure"),
+    "form incomplete": (True, "Form incomplete"),
+    "not billable": (False, "Not billable"),
+}
+
+RECOMMENDED_CHANGES: Dict[str, str] = {
+    "Missing modifier": "Add the appropriate modifier based on payer rules and resubmit",
+    "Incorrect NPI": "Correct the NPI (rendering and/or billing) and resubmit",
+    "Prior auth required": "Obtain or attach proof of prior authorization and resubmit",
+    "Authorization expired": "Obtain a new authorization; resubmit only if policy allows",
+    "Incorrect provider type": "Verify provider taxonomy/role and adjust claim if applicable",
+    "Incorrect procedure": "Verify the CPT/HCPCS code; correct coding prior to any resubmission",
+    "Form incomplete": "Fill all required fields and attach missing documentation, then resubmit",
+    "Not billable": "Review payer policy; consider alternative coding or an appeal",
+}
+
+
+def _build_reason_table() -> Dict[str, Tuple[bool, str, Optional[str]]]:
+    # lowercased_input -> (is_retryable, canonical_reason, recommended_change)
+    entries = itertools.chain(
+        ((key, True, canonical) for key, canonical in RETRYABLE_REASONS.items()),
+        ((key, False, canonical) for key, canonical in NON_RETRYABLE_REASONS.items()),
+        ((key, is_retryable, canonical) for key, (is_retryable, canonical) in AMBIGUOUS_REASONS.items()),
+    )
+    # Intern so every candidate shares one object per canonical string
+    return {
+        sys.intern(key): (is_retryable, sys.intern(canonical), RECOMMENDED_CHANGES.get(canonical))
+        for key, is_retryable, canonical in entries
+    }
 
 
+_REASON_TABLE = _build_reason_table()
+
+
+@lru_cache(maxsize=1024)
 def classify_denial_reason(raw_reason: Optional[str]) -> Tuple[bool, Optional[str], Optional[str]]:
     reason = canonicalize_denial_reason(raw_reason)
     if reason is None:
         return (False, None, "No denial reason provided; cannot determine if retryable")
 
-    # Canonical mappings (case-insensitive comparisons)
-    retryable_map: Dict[str, str] = {
-        "missing modifier": "Missing modifier",
-        "incorrect npi": "Incorrect NPI",
-        "prior auth required": "Prior auth required",
-    }
-    non_retryable_map: Dict[str, str] = {
-        "authorization expired": "Authorization expired",
-        "incorrect provider type": "Incorrect provider type",
-    }
-    ambiguous_map: Dict[str, Tuple[bool, str]] = {
-        # Heuristics for ambiguous reasons
-        # format: lowercased_input -> (is_retryable, canonical_reason)
-        "incorrect procedure": (False, "Incorrect procedure"),
-        "form incomplete": (True, "Form incomplete"),
-        "not billable": (False, "Not billable"),
-    }
-
-    recommended_changes: Dict[str, str] = {
-        "Missing modifier": "Add the appropriate modifier based on payer rules and resubmit",
-        "Incorrect NPI": "Correct the NPI (rendering and/or billing) and resubmit",
-        "Prior auth required": "Obtain or attach proof of prior authorization and resubmit",
-        "Authorization expired": "Obtain a new authorization; resubmit only if policy allows",
-        "Incorrect provider type": "Verify provider taxonomy/role and adjust claim if applicable",
-        "Incorrect procedure": "Verify the CPT/HCPCS code; correct coding prior to any resubmission",
-        "Form incomplete": "Fill all required fields and attach missing documentation, then resubmit",
-        "Not billable": "Review payer policy; consider alternative coding or an appeal",
-    }
-
-    key = reason.lower()
-    if key in retryable_map:
-        canonical = retryable_map[key]
-        return (True, canonical, recommended_changes.get(canonical))
-    if key in non_retryable_map:
-        canonical = non_retryable_map[key]
-        return (False, canonical, recommended_changes.get(canonical))
-    if key in ambiguous_map:
-        is_retryable, canonical = ambiguous_map[key]
-        return (is_retryable, canonical, recommended_changes.get(canonical))
+    hit = _REASON_TABLE.get(reason.lower())
+    if hit is not None:
+        return hit
 
     # Default heuristic: treat unknown reasons as non-retryable but report
     return (False, reason, f"Unrecognized denial reason '{reason}'; defaulting to non-retryable")
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class NormalizedClaim:
     claim_id: Optional[str]
     patient_id: Optional[str]
@@ -130,178 +192,369 @@ class NormalizedClaim:
     denial_reason: Optional[str]
     status: Optional[str]  # "approved" | "denied"
     submitted_at: Optional[str]  # ISO date YYYY-MM-DD
+    submitted_date: Optional[date]  # parsed submitted_at, used by eligibility
     source_system: str
 
 
-def normalize_alpha_row(row: Dict[str, str]) -> NormalizedClaim:
+ALPHA_COLUMNS = ("claim_id", "patient_id", "procedure_code", "denial_reason", "status", "submitted_at")
+
+
+def normalize_alpha_fields(claim_id: Optional[str], patient_id: Optional[str], procedure_code: Optional[str],
+                           denial_reason: Optional[str], status: Optional[str],
+                           submitted_at: Optional[str]) -> NormalizedClaim:
+    submitted_date = to_date(submitted_at)
     return NormalizedClaim(
-        claim_id=normalize_string_or_none(row.get("claim_id")),
-        patient_id=normalize_string_or_none(row.get("patient_id")),
-        procedure_code=normalize_string_or_none(row.get("procedure_code")),
-        denial_reason=canonicalize_denial_reason(row.get("denial_reason")),
-        status=normalize_status(row.get("status")),
-        submitted_at=to_iso_date_string(row.get("submitted_at")),
-        source_system="alpha",
+        claim_id=normalize_string_or_none(claim_id),
+        patient_id=normalize_string_or_none(patient_id),
+        procedure_code=normalize_string_or_none(procedure_code),
+        denial_reason=canonicalize_denial_reason(denial_reason),
+        status=normalize_status(status),
+        submitted_at=submitted_date.isoformat() if submitted_date is not None else None,
+        submitted_date=submitted_date,
+        source_system=SOURCE_ALPHA,
     )
 
 
+def normalize_alpha_row(row: Dict[str, str]) -> NormalizedClaim:
+    return normalize_alpha_fields(*(row.get(name) for name in ALPHA_COLUMNS))
+
+
+def _json_scalar(value: object) -> object:
+    # ijson yields non-integer numbers as Decimal; render them as json.load's float would
+    return float(value) if isinstance(value, Decimal) else value
+
+
 def normalize_beta_record(rec: Dict[str, object]) -> NormalizedClaim:
+    submitted_date = to_date(_json_scalar(rec.get("date")))
     return NormalizedClaim(
-        claim_id=normalize_string_or_none(rec.get("id")),
-        patient_id=normalize_string_or_none(rec.get("member")),
-        procedure_code=normalize_string_or_none(rec.get("code")),
-        denial_reason=canonicalize_denial_reason(rec.get("error_msg")),
+        claim_id=normalize_string_or_none(_json_scalar(rec.get("id"))),
+        patient_id=normalize_string_or_none(_json_scalar(rec.get("member"))),
+        procedure_code=normalize_string_or_none(_json_scalar(rec.get("code"))),
+        denial_reason=canonicalize_denial_reason(_json_scalar(rec.get("error_msg"))),
         status=normalize_status(str(rec.get("status")) if rec.get("status") is not None else None),
-        submitted_at=to_iso_date_string(str(rec.get("date")) if rec.get("date") is not None else None),
-        source_system="beta",
+        submitted_at=submitted_date.isoformat() if submitted_date is not None else None,
+        submitted_date=submitted_date,
+        source_system=SOURCE_BETA,
     )
 
 
-def read_alpha_csv(path: Path) -> Iterable[NormalizedClaim]:
-    with path.open("r", newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
+class _RawReader(io.RawIOBase):
+    """Raw stream view over an object that only has read(), so TextIOWrapper can wrap it."""
+
+    def __init__(self, fp: BinaryIO) -> None:
+        self._fp = fp
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._fp.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def read_alpha_csv_stream(fp: BinaryIO) -> Iterable[NormalizedClaim]:
+    if not isinstance(fp, io.IOBase):
+        # e.g. SpooledTemporaryFile before Python 3.11, which lacks readable()/read1()
+        fp = io.BufferedReader(_RawReader(fp))
+    text = io.TextIOWrapper(fp, encoding="utf-8", newline="")
+    try:
+        # Positional rows avoid building a dict per row the way csv.DictReader does
+        reader = csv.reader(text)
+        header = next(reader, None)
+        if header is None:
+            return
+        index = {name: i for i, name in enumerate(header)}
+        width = len(header)
+        # Columns absent from the header read a padding cell just past it, which is always None
+        ci, pi, pc, dr, st, sa = positions = [index.get(name, width) for name in ALPHA_COLUMNS]
+        has_absent = width in positions
         for row in reader:
+            if not row:
+                # Skip blank lines, as csv.DictReader does
+                continue
+            if len(row) < width:
+                # Pad short rows with None, matching csv.DictReader's restval
+                row.extend([None] * (width - len(row)))
+            if has_absent:
+                # Extra trailing fields must not land in the padding cell
+                del row[width:]
+                row.append(None)
             try:
-                yield normalize_alpha_row(row)
+                yield normalize_alpha_fields(row[ci], row[pi], row[pc], row[dr], row[st], row[sa])
             except Exception as exc:
                 logging.warning("Failed to normalize alpha row: %s | error=%s", row, exc)
+    finally:
+        # Leave the caller's stream open
+        text.detach()
+
+
+def read_alpha_csv(path: Path) -> Iterable[NormalizedClaim]:
+    with path.open("rb") as f:
+        yield from read_alpha_csv_stream(f)
+
+
+_PEEK_SIZE = 1 << 16
+
+
+class _PrefixedReader:
+    """Replays already-read bytes before continuing with the underlying stream."""
+
+    def __init__(self, prefix: bytes, fp: BinaryIO) -> None:
+        self._prefix = prefix
+        self._fp = fp
+
+    def read(self, size: int = -1) -> bytes:
+        if not self._prefix:
+            return self._fp.read(size)
+        if size < 0:
+            data, self._prefix = self._prefix + self._fp.read(), b""
+        else:
+            data, self._prefix = self._prefix[:size], self._prefix[size:]
+        return data
+
+
+def read_beta_json_stream(fp: BinaryIO) -> Iterable[NormalizedClaim]:
+    # Stream records one at a time instead of materializing the whole array
+    # Peek at the first significant byte so ijson can still read the file object directly (its C fast path)
+    prefix = b""
+    while True:
+        chunk = fp.read(_PEEK_SIZE)
+        prefix = chunk.lstrip()
+        if prefix or not chunk:
+            break
+    # Parse errors (including an empty file) propagate, as they did with json.load
+    reader = _PrefixedReader(prefix, fp)
+    if prefix and not prefix.startswith(b"["):
+        # Parse the whole value so corrupt input still raises; only a valid non-array root is skipped
+        for _ in ijson.parse(reader):
+            pass
+        logging.warning("Beta JSON is not a list; skipping")
+        return
+    for rec in ijson.items(reader, "item"):
+        if not isinstance(rec, dict):
+            logging.warning("Beta JSON record is not an object: %s", rec)
+            continue
+        try:
+            yield normalize_beta_record(rec)
+        except Exception as exc:
+            logging.warning("Failed to normalize beta record: %s | error=%s", rec, exc)
 
 
 def read_beta_json(path: Path) -> Iterable[NormalizedClaim]:
-    with path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-        if not isinstance(data, list):
-            logging.warning("Beta JSON is not a list; skipping")
-            return
-        for rec in data:
-            if not isinstance(rec, dict):
-                logging.warning("Beta JSON record is not an object: %s", rec)
-                continue
-            try:
-                yield normalize_beta_record(rec)
-            except Exception as exc:
-                logging.warning("Failed to normalize beta record: %s | error=%s", rec, exc)
+    with path.open("rb") as f:
+        yield from read_beta_json_stream(f)
 
 
 @dataclass
 class PipelineMetrics:
     total_claims_processed: int = 0
-    claims_by_source: Dict[str, int] = field(default_factory=lambda: {"alpha": 0, "beta": 0})
+    claims_by_source: Counter[str] = field(default_factory=lambda: Counter({SOURCE_ALPHA: 0, SOURCE_BETA: 0}))
     eligible_for_resubmission: int = 0
-    excluded_reasons_count: Dict[str, int] = field(
-        default_factory=lambda: {
+    excluded_reasons_count: Counter[str] = field(
+        default_factory=lambda: Counter({
             "status_not_denied": 0,
             "missing_patient_id": 0,
             "too_recent": 0,
             "non_retryable_reason": 0,
             "malformed_record": 0,
-        }
+        })
     )
 
 
 def increment(metrics: PipelineMetrics, key: str) -> None:
-    metrics.excluded_reasons_count[key] = metrics.excluded_reasons_count.get(key, 0) + 1
+    metrics.excluded_reasons_count[key] += 1
+
+
+# Shared result for claims rejected before their denial reason is classified
+NOT_ELIGIBLE: Tuple[bool, Optional[str], Optional[str]] = (False, None, None)
 
 
 def is_eligible_for_resubmission(claim: NormalizedClaim, metrics: PipelineMetrics) -> Tuple[bool, Optional[str], Optional[str]]:
+    # Cheapest checks first; the denial reason is only classified once they all pass
     # Step 1: status must be denied
     if claim.status != "denied":
         increment(metrics, "status_not_denied")
-        return (False, None, None)
+        return NOT_ELIGIBLE
 
     # Step 2: patient_id must not be null
     if not claim.patient_id:
         increment(metrics, "missing_patient_id")
-        return (False, None, None)
+        return NOT_ELIGIBLE
 
     # Step 3: submitted_at more than 7 days ago relative to REFERENCE_TODAY
-    delta_days = days_between(claim.submitted_at, REFERENCE_TODAY)
-    if delta_days is None or delta_days <= 7:
+    if claim.submitted_date is None or claim.submitted_date >= SUBMISSION_CUTOFF:
         increment(metrics, "too_recent")
-        return (False, None, None)
+        return NOT_ELIGIBLE
 
     # Step 4: denial_reason is retryable or inferred retryable
-    retryable, canonical_reason, suggestion = classify_denial_reason(claim.denial_reason)
-    if not retryable:
+    # The cached classification tuple already has the (eligible, reason, suggestion) shape
+    classification = classify_denial_reason(claim.denial_reason)
+    if not classification[0]:
         increment(metrics, "non_retryable_reason")
-        return (False, canonical_reason, suggestion)
+    return classification
 
-    return (True, canonical_reason, suggestion)
 
+OUTPUT_FORMATS = ("json", "jsonl")
 
-def process_claims(alpha_path: Path, beta_path: Path, 
-                   out_path: Path, metrics_out_path: Optional[Path], 
-                   rejections_log_path: Optional[Path]) -> None:
-    metrics = PipelineMetrics()
-    candidates: List[Dict[str, Optional[str]]] = []
+# Process umask, read once at import (os.umask can only be queried by setting it)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
 
-    # Ensure rejections log file exists even if no malformed records are encountered
-    if rejections_log_path is not None:
-        rejections_log_path.parent.mkdir(parents=True, exist_ok=True)
-        if not rejections_log_path.exists():
-            with rejections_log_path.open("w", encoding="utf-8"):
-                pass
 
-    def handle_claim(claim: NormalizedClaim) -> None:
-        metrics.total_claims_processed += 1
-        metrics.claims_by_source[claim.source_system] = metrics.claims_by_source.get(claim.source_system, 0) + 1
+def check_output_format(output_format: str) -> None:
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output format '{output_format}'; expected one of {OUTPUT_FORMATS}")
 
-        try:
-            eligible, canonical_reason, suggestion = is_eligible_for_resubmission(claim, metrics)
-        except Exception as exc:
-            increment(metrics, "malformed_record")
-            logging.error("Eligibility check failed for claim_id=%s source=%s error=%s", claim.claim_id, claim.source_system, exc)
-            if rejections_log_path is not None:
-                with rejections_log_path.open("a", encoding="utf-8") as rej:
-                    rej.write(json.dumps({
-                        "claim": claim.__dict__,
-                        "error": str(exc),
-                    }) + "\n")
-            return
 
-        if eligible:
-            metrics.eligible_for_resubmission += 1
-            candidates.append({
-                "claim_id": claim.claim_id,
-                "resubmission_reason": canonical_reason,
-                "source_system": claim.source_system,
-                "recommended_changes": suggestion,
-            })
-
-    # Read and handle claims from both sources
-    if alpha_path.exists():
-        for claim in read_alpha_csv(alpha_path):
-            handle_claim(claim)
-    else:
-        logging.warning("Alpha source not found at %s", alpha_path)
-
-    if beta_path.exists():
-        for claim in read_beta_json(beta_path):
-            handle_claim(claim)
-    else:
-        logging.warning("Beta source not found at %s", beta_path)
-
-    # Save candidates
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    with out_path.open("w", encoding="utf-8") as f:
-        json.dump(candidates, f, indent=2)
-    logging.info("Saved %d resubmission candidates to %s", len(candidates), out_path)
+class CandidateWriter:
+    """Streams candidates to a binary file as they are emitted.
 
-    # Save metrics if requested
-    metrics_dict = {
+    "json" writes a pretty-printed array (same layout as OPT_INDENT_2),
+    "jsonl" writes one compact object per line.
+    """
+
+    def __init__(self, fp: BinaryIO, output_format: str = "json") -> None:
+        check_output_format(output_format)
+        self.fp = fp
+        self.output_format = output_format
+        self.count = 0
+
+    def write(self, candidate: Dict[str, Optional[str]]) -> None:
+        if self.output_format == "jsonl":
+            self.fp.write(orjson.dumps(candidate) + b"\n")
+        else:
+            # Serialized JSON never contains raw newlines inside strings, so re-indenting is safe
+            body = orjson.dumps(candidate, option=orjson.OPT_INDENT_2).replace(b"\n", b"\n  ")
+            self.fp.write((b"[\n  " if self.count == 0 else b",\n  ") + body)
+        self.count += 1
+
+    def close(self) -> None:
+        if self.output_format == "json":
+            self.fp.write(b"\n]" if self.count else b"[]")
+
+
+def handle_claim(claim: NormalizedClaim, metrics: PipelineMetrics,
+                 emit_candidate: Callable[[Dict[str, Optional[str]]], None],
+                 rejections_fp: Optional[BinaryIO]) -> None:
+    metrics.total_claims_processed += 1
+    metrics.claims_by_source[claim.source_system] += 1
+
+    try:
+        result = is_eligible_for_resubmission(claim, metrics)
+    except Exception as exc:
+        increment(metrics, "malformed_record")
+        logging.error("Eligibility check failed for claim_id=%s source=%s error=%s", claim.claim_id, claim.source_system, exc)
+        if rejections_fp is not None:
+            rejections_fp.write(orjson.dumps({
+                "claim": asdict(claim),
+                "error": str(exc),
+            }) + b"\n")
+        return
+
+    if result is NOT_ELIGIBLE:
+        return
+    eligible, canonical_reason, suggestion = result
+    if eligible:
+        metrics.eligible_for_resubmission += 1
+        emit_candidate({
+            "claim_id": claim.claim_id,
+            "resubmission_reason": canonical_reason,
+            "source_system": claim.source_system,
+            "recommended_changes": suggestion,
+        })
+
+
+def run_claims(sources: Iterable[Iterable[NormalizedClaim]],
+               emit_candidate: Callable[[Dict[str, Optional[str]]], None],
+               rejections_fp: Optional[BinaryIO]) -> PipelineMetrics:
+    metrics = PipelineMetrics()
+    # State is passed as arguments from fast locals rather than captured in a per-run closure
+    handle = handle_claim
+    for claim in itertools.chain.from_iterable(sources):
+        handle(claim, metrics, emit_candidate, rejections_fp)
+    return metrics
+
+
+def metrics_to_dict(metrics: PipelineMetrics) -> Dict[str, object]:
+    return {
         "total_claims_processed": metrics.total_claims_processed,
         "claims_by_source": metrics.claims_by_source,
         "eligible_for_resubmission": metrics.eligible_for_resubmission,
         "excluded_reasons_count": metrics.excluded_reasons_count,
     }
+
+
+def process_claims_stream(alpha_fp: Optional[BinaryIO],
+                          beta_fp: Optional[BinaryIO]) -> Tuple[List[Dict[str, Optional[str]]], Dict[str, object]]:
+    """Run the pipeline over binary streams and return (candidates, metrics) without touching disk."""
+    sources = []
+    if alpha_fp is not None:
+        sources.append(read_alpha_csv_stream(alpha_fp))
+    if beta_fp is not None:
+        sources.append(read_beta_json_stream(beta_fp))
+
+    candidates: List[Dict[str, Optional[str]]] = []
+    metrics = run_claims(sources, candidates.append, rejections_fp=None)
+    return candidates, metrics_to_dict(metrics)
+
+
+def process_claims(alpha_path: Path, beta_path: Path, 
+                   out_path: Path, metrics_out_path: Optional[Path], 
+                   rejections_log_path: Optional[Path],
+                   output_format: str = "json") -> None:
+    check_output_format(output_format)
+
+    # Stream candidates into a temp file next to out_path; the previous output stays intact until the run succeeds
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_tmp = tempfile.NamedTemporaryFile("wb", dir=out_path.parent, prefix=f".{out_path.name}.", suffix=".tmp", delete=False)
+    out_tmp_path = Path(out_tmp.name)
+    try:
+        with ExitStack() as stack:
+            candidates = CandidateWriter(stack.enter_context(out_tmp), output_format)
+
+            # Open the rejections log once up front; this also creates it even if no malformed records are encountered
+            rejections_fp: Optional[BinaryIO] = None
+            if rejections_log_path is not None:
+                rejections_log_path.parent.mkdir(parents=True, exist_ok=True)
+                rejections_fp = stack.enter_context(rejections_log_path.open("ab"))
+
+            # Read and handle claims from both sources, alpha first
+            sources = []
+            if alpha_path.exists():
+                sources.append(read_alpha_csv(alpha_path))
+            else:
+                logging.warning("Alpha source not found at %s", alpha_path)
+
+            if beta_path.exists():
+                sources.append(read_beta_json(beta_path))
+            else:
+                logging.warning("Beta source not found at %s", beta_path)
+
+            metrics = run_claims(sources, candidates.write, rejections_fp)
+            candidates.close()
+        # NamedTemporaryFile is created 0600; keep the existing output's mode, or what open() would have used
+        if out_path.exists():
+            shutil.copymode(out_path, out_tmp_path)
+        else:
+            out_tmp_path.chmod(0o666 & ~_UMASK)
+        os.replace(out_tmp_path, out_path)
+    except BaseException:
+        out_tmp_path.unlink(missing_ok=True)
+        raise
+    logging.info("Saved %d resubmission candidates to %s", candidates.count, out_path)
+
+    # Save metrics if requested
+    # Serialize once and reuse the payload for both the file and the log summary
+    metrics_payload = orjson.dumps(metrics_to_dict(metrics), option=orjson.OPT_INDENT_2)
     if metrics_out_path is not None:
         metrics_out_path.parent.mkdir(parents=True, exist_ok=True)
-        with metrics_out_path.open("w", encoding="utf-8") as mf:
-            json.dump(metrics_dict, mf, indent=2)
+        with metrics_out_path.open("wb") as mf:
+            mf.write(metrics_payload)
         logging.info("Saved metrics to %s", metrics_out_path)
 
-    # Also print a concise metrics summary
-    logging.info("Metrics summary: %s", json.dumps(metrics_dict))
+    # Also print a metrics summary
+    logging.info("Metrics summary: %s", metrics_payload.decode())
 
 
 def build_arg_parser() -> argparse.ArgumentParser:
@@ -312,6 +565,7 @@ def build_arg_parser() -> argparse.ArgumentParser:
     parser.add_argument("--out", type=Path, default=Path(__file__).parent / "resubmission_candidates.json", help="Output JSON file for candidates")
     parser.add_argument("--metrics", type=Path, default=Path(__file__).parent / "metrics.json", help="Output JSON file for metrics")
     parser.add_argument("--rejections", type=Path, default=Path(__file__).parent / "rejections.jsonl", help="JSONL log file for rejected/malformed records")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="json", help="Candidates output format: JSON array or JSONL")
     return parser
 
 
@@ -326,6 +580,7 @@ def main() -> None:
         out_path=args.out,
         metrics_out_path=args.metrics,
         rejections_log_path=args.rejections,
+        output_format=args.format,
     )
 
 
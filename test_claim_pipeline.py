@@ -0,0 +1,86 @@
+import csv
+import io
+import unittest
+
+import ijson
+
+from claim_pipeline import ALPHA_COLUMNS, read_alpha_csv_stream, read_beta_json_stream
+
+
+def read_alpha(text):
+    return list(read_alpha_csv_stream(io.BytesIO(text.encode("utf-8"))))
+
+
+def read_alpha_baseline(text):
+    # Field values as csv.DictReader exposes them
+    return [[row.get(name) for name in ALPHA_COLUMNS] for row in csv.DictReader(io.StringIO(text)) if row]
+
+
+class ReadAlphaCsvTest(unittest.TestCase):
+    def assertMatchesDictReader(self, text):
+        claims = read_alpha(text)
+        expected = read_alpha_baseline(text)
+        self.assertEqual(len(claims), len(expected))
+        for claim, fields in zip(claims, expected):
+            self.assertEqual(claim.claim_id, fields[0] or None)
+            self.assertEqual(claim.patient_id, fields[1] or None)
+            self.assertEqual(claim.procedure_code, fields[2] or None)
+            self.assertEqual(claim.denial_reason, fields[3] or None)
+
+    def test_short_rows_are_padded_with_none(self):
+        text = "claim_id,patient_id,procedure_code,denial_reason,submitted_at,status\nA1,P1\n"
+        (claim,) = read_alpha(text)
+        self.assertEqual((claim.claim_id, claim.patient_id), ("A1", "P1"))
+        self.assertIsNone(claim.procedure_code)
+        self.assertIsNone(claim.denial_reason)
+        self.assertIsNone(claim.status)
+        self.assertIsNone(claim.submitted_date)
+        self.assertMatchesDictReader(text)
+
+    def test_long_rows_ignore_extra_fields(self):
+        text = "claim_id,patient_id,procedure_code,denial_reason,submitted_at,status\nA1,P1,99213,Missing modifier,2025-07-01,denied,extra\n"
+        (claim,) = read_alpha(text)
+        self.assertEqual(claim.denial_reason, "Missing modifier")
+        self.assertEqual(claim.status, "denied")
+        self.assertMatchesDictReader(text)
+
+    def test_missing_columns_read_as_none_even_with_extra_fields(self):
+        text = "claim_id,patient_id,status,submitted_at\nA1,P1,denied,2025-07-01,Missing modifier\n"
+        (claim,) = read_alpha(text)
+        self.assertEqual((claim.claim_id, claim.patient_id, claim.status), ("A1", "P1", "denied"))
+        self.assertIsNone(claim.procedure_code)
+        self.assertIsNone(claim.denial_reason)
+        self.assertMatchesDictReader(text)
+
+    def test_blank_header_line_reads_all_fields_as_none(self):
+        text = "\nclaim_id,patient_id,procedure_code,denial_reason,submitted_at,status\nA1,P1,99213,Missing modifier,2025-07-01,denied\n"
+        claims = read_alpha(text)
+        self.assertEqual(len(claims), 2)
+        for claim in claims:
+            self.assertIsNone(claim.claim_id)
+            self.assertIsNone(claim.patient_id)
+            self.assertIsNone(claim.denial_reason)
+            self.assertIsNone(claim.status)
+        self.assertMatchesDictReader(text)
+
+
+class ReadBetaJsonTest(unittest.TestCase):
+    def read_beta(self, data):
+        return list(read_beta_json_stream(io.BytesIO(data)))
+
+    def test_array_root_yields_records(self):
+        (claim,) = self.read_beta(b'  [{"id": "B1", "member": "P1", "status": "denied"}]')
+        self.assertEqual((claim.claim_id, claim.patient_id, claim.status), ("B1", "P1", "denied"))
+
+    def test_valid_non_array_root_is_skipped(self):
+        with self.assertLogs(level="WARNING"):
+            self.assertEqual(self.read_beta(b'{"id": "B1"}'), [])
+
+    def test_corrupt_input_raises(self):
+        for data in (b"xyz", b"<html></html>", b'\xef\xbb\xbf[{"id": "B1"}]', b'{"id": "B1"', b'[{"id": "B1"}', b""):
+            with self.subTest(data=data), self.assertRaises(ijson.JSONError):
+                self.read_beta(data)
+
+
+if __name__ == "__main__":
+    unittest.main()